@@ -14,59 +14,84 @@ import argparse
 
 import time
 
+try:
+	import uvloop
+except ImportError: # uvloop n'est pas disponible sous Windows
+	uvloop = None
+
 # ----------------- INIT BOT -----------------------
 intents = discord.Intents.default()
 intents.message_content = True 
-bot = commands.Bot(command_prefix="!", intents=intents)
+
+# Une seule API pour toute la vie du bot, pour que son cache serve d'une commande à l'autre
+api = JdmApi()
+
+class InferenceBot(commands.Bot):
+	async def setup_hook(self):
+		await api.__aenter__()
+
+	async def on_ready(self):
+		# Termes les plus demandés, à précharger au démarrage (ex: JDM_WARM_TERMS=chat,pizza,animal)
+		warm_terms = [t.strip() for t in os.getenv("JDM_WARM_TERMS", "").split(",") if t.strip()]
+		if warm_terms:
+			await api.warm_up(warm_terms)
+
+	async def close(self):
+		await super().close()
+		await JdmApi.aclose()
+
+bot = InferenceBot(command_prefix="!", intents=intents)
 
 
 # ------------------- UTILS ------------------------
+_INPUT_RE = re.compile(r"(.+?)\s+(r_\S+)\s+(.+)")
+
 def parse_input(sentence: str) -> tuple[str, str, str] | None:
 	"""Parse input sentence into word1, relation, and word2."""
-	match = re.match(r"(.+?)\s+(r_\S+)\s+(.+)", sentence)
-	if match:
-		return match.groups()
-	return None
+	match = _INPUT_RE.match(sentence)
+	return match.groups() if match else None
 
 # ------------------- CLI ------------------------
 
 async def main_console() -> None:
-	async with JdmApi() as api:
-		inferer = RelationInferer(api=api)
-		while(True):
+	try:
+		async with JdmApi() as api:
+			inferer = RelationInferer(api=api)
+			while(True):
 
-			try:
-				sentence = input("Enter a sentence (word1 r_relation word2): ").strip() or "pizza r_has_part mozza"
-				parsed_sentence = parse_input(sentence)
+				try:
+					sentence = input("Enter a sentence (word1 r_relation word2): ").strip() or "pizza r_has_part mozza"
+					parsed_sentence = parse_input(sentence)
 
-				if not parsed_sentence:
-					print("Invalid input format. Please use 'word1 r_relation word2'.")
-					continue
+					if not parsed_sentence:
+						print("Invalid input format. Please use 'word1 r_relation word2'.")
+						continue
 				
-				sujet, rel, objet = parsed_sentence
+					sujet, rel, objet = parsed_sentence
 
-				rprint(f"[bold blue]Parsed Sentence:[/bold blue] {sujet} {rel} {objet}")
+					rprint(f"[bold blue]Parsed Sentence:[/bold blue] {sujet} {rel} {objet}")
 
-				# Check if the relation is valid
-				rel_type = api.get_relation_type_by_name(rel)
-				if not rel_type:
-					rprint(f"[red]Relation '{rel}' not found in the API.[/red]")
-					continue
+					# Check if the relation is valid
+					rel_type = api.get_relation_type_by_name(rel)
+					if not rel_type:
+						rprint(f"[red]Relation '{rel}' not found in the API.[/red]")
+						continue
 
-				start = time.time()
-				await inferer.run(sujet, rel, objet)
-				print(f"Temps d'exécution : {time.time() - start:.4f} secondes")
+					start = time.time()
+					await inferer.run(sujet, rel, objet)
+					print(f"Temps d'exécution : {time.time() - start:.4f} secondes")
 
 
-			except TermNotFoundError as e:
-				if e.status_code == 500:
-					rprint(f"❌ [bold]Erreur serveur[/bold]: Le terme `{e.term_name}` a causé une erreur interne (500). Il pourrait ne pas exister ou contenir des caractères spéciaux.")
-				else:
-					rprint(f"❌ [bold]Terme non trouvé[/bold]: `{e.term_name}` n'existe pas dans la base de données.")
-			except SystemExit:
-				rprint("Erreur de syntaxe dans la commande.")
-				
-			
+				except TermNotFoundError as e:
+					if e.status_code == 500:
+						rprint(f"❌ [bold]Erreur serveur[/bold]: Le terme `{e.term_name}` a causé une erreur interne (500). Il pourrait ne pas exister ou contenir des caractères spéciaux.")
+					else:
+						rprint(f"❌ [bold]Terme non trouvé[/bold]: `{e.term_name}` n'existe pas dans la base de données.")
+				except SystemExit:
+					rprint("Erreur de syntaxe dans la commande.")
+	finally:
+		# La session HTTP est partagée, on la ferme une fois en quittant
+		await JdmApi.aclose()
 
 
 # ------------------- BOT FUNC ------------------------
@@ -98,28 +123,27 @@ async def inference(ctx, sujet, relation, objet, *args):
 	parser.add_argument("--limit", type=int, default=10, help='Limite de résultats (défaut: 10)')
 
 	try:
-		async with JdmApi() as api:
-			args = parser.parse_args(shlex.split(" ".join(args)))
-			await ctx.send(f"## Inférence de {sujet} {relation} {objet} avec limite {args.limit}")
+		args = parser.parse_args(shlex.split(" ".join(args)))
+		await ctx.send(f"## Inférence de {sujet} {relation} {objet} avec limite {args.limit}")
 
-			rel_type = api.get_relation_type_by_name(relation)
-			if not rel_type:
-				rprint(f"[red]Relation '{relation}' not found in the API.[/red]")
-				await ctx.send(f"Relation '{relation}' not found in the API.")
-				return
+		rel_type = api.get_relation_type_by_name(relation)
+		if not rel_type:
+			rprint(f"[red]Relation '{relation}' not found in the API.[/red]")
+			await ctx.send(f"Relation '{relation}' not found in the API.")
+			return
 
-			start = time.time()
+		start = time.time()
 
-			logger = log.InferenceLoggerBot(context=ctx, verbose=True)
-			await RelationInferer(
-				limit=args.limit,
-				api=api,
-				inferenceLogger= logger
-			).run(sujet, relation, objet)
+		logger = log.InferenceLoggerBot(context=ctx, verbose=True)
+		await RelationInferer(
+			limit=args.limit,
+			api=api,
+			inferenceLogger= logger
+		).run(sujet, relation, objet)
 
-			await logger.send_all()
+		await logger.send_all()
 
-			print(f"Temps d'exécution : {time.time() - start:.4f} secondes")
+		print(f"Temps d'exécution : {time.time() - start:.4f} secondes")
 	except TermNotFoundError as e:
 				if e.status_code == 500:
 					await ctx.send(f"❌ **Erreur serveur**: Le terme `{e.term_name}` a causé une erreur interne (500). Il pourrait ne pas exister ou contenir des caractères spéciaux.")
@@ -129,6 +153,22 @@ async def inference(ctx, sujet, relation, objet, *args):
 		await ctx.send("Erreur de syntaxe dans la commande.")
 
 
+@bot.command()
+@commands.is_owner()
+async def cache_stats(ctx):
+	"""Affiche l'état du cache de l'API JDM."""
+	stats = api.cache.stats()
+	await ctx.send(f"Cache : {stats['size']}/{stats['maxsize']} entrées, {stats['hits']} hits, {stats['misses']} misses")
+
+
+@bot.command()
+@commands.is_owner()
+async def cache_clear(ctx):
+	"""Vide les caches de l'API JDM (mémoire et HTTP sur disque)."""
+	await api.clear_cache()
+	await ctx.send("Cache vidé (mémoire et disque).")
+
+
 def main() -> None:
 
 	parser = argparse.ArgumentParser()
@@ -138,6 +178,10 @@ def main() -> None:
 	
 	args = parser.parse_args()
 
+	# Boucle asyncio plus rapide pour les nombreuses petites requêtes HTTP (bot comme CLI)
+	if uvloop is not None:
+		asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
 	if args.bot:
 		main_bot()
 	else :
@@ -1,4 +1,4 @@
-from src.jdm_api import EndpointParams, JdmApi, Term
+from src.jdm_api import EndpointParams, JdmApi, Relation, RelationResult, Term
 from rich import print as rprint
 
 import src.logger as log
@@ -6,11 +6,25 @@ import logging
 import traceback
 
 import asyncio
+import heapq
 
-from statistics import harmonic_mean
+import numpy as np
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
 
-@dataclass
+_log = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 100
+# Taille maximale de l'index des relations finales ; au-delà, les intermédiaires absents sont vérifiés un par un
+FINAL_INDEX_LIMIT = 1000
+
+@lru_cache(maxsize=None)
+def _make_params(types_ids: tuple[int, ...], limit: int = DEFAULT_LIMIT) -> EndpointParams:
+	"""Paramètres de requête partagés entre tous les appels : l'instance renvoyée ne doit pas être modifiée."""
+	return EndpointParams(types_ids=types_ids, min_weight=1, limit=limit)
+
+@dataclass(slots=True)
 class Inference:
 	sujet	: str
 	objet	: str
@@ -21,15 +35,15 @@ class Inference:
 
 	t 		: str # type d'inférence : isa | hypo | 
 	rel		: str # type de relation : has_part | lieu | ... 
-	score	: float = 0.0,
+	score	: float = 0.0
 
-	annotation_weight1 : float = 1.0,
-	annotation_weight2 : float = 1.0,
+	annotation_weight1 : float = 1.0
+	annotation_weight2 : float = 1.0
 
 
 
 class RelationInferer:
-	def __init__(self, api:JdmApi, limit=10, inferenceLogger = log.InferenceLogger()):
+	def __init__(self, api:JdmApi, limit=10, inferenceLogger = log.InferenceLogger(), max_branch=None):
 		"""
         Initialise un inféreur de relations basé sur une trame (sujet, relation, objet) en s'appuyant sur l'API JDM.
 
@@ -42,264 +56,249 @@ class RelationInferer:
         - objet (str) : Terme d'arrivée de la relation.
         - api (JdmApi) : Instance de l'API JDM utilisée pour interroger le graphe lexical.
         - limit (int) : Nombre maximal de résultats à retourner (par défaut : 10).
+        - max_branch (int) : Nombre de chemins complets (intermédiaires qui mènent bien à l'objet) gardés par stratégie, les plus forts d'abord (par défaut : 4 * limit).
         """
 
 		self.api = api
 		self.limit = limit
-		self.default_params = EndpointParams(min_weight=1, limit=100)
+		self.max_branch = max_branch or limit * 4
 		self.logger = inferenceLogger
+		# Types de relations utilisés par les stratégies, résolus une seule fois
+		self._isa_id = api.get_relation_type_by_name("r_isa").id
+		self._hypo_id = api.get_relation_type_by_name("r_hypo").id
+		self._syn_id = api.get_relation_type_by_name("r_syn").id
+		# Cache des requêtes d'un run : plusieurs stratégies demandent souvent les mêmes relations
+		self._rel_cache: dict[tuple, asyncio.Task] = {}
+		# Borne le nombre de requêtes simultanées lancées par toutes les stratégies réunies
+		self._sem = asyncio.Semaphore(16)
+
+	async def _cached(self, key: tuple, fetch):
+		"""Partage une seule requête entre tous les appelants d'une même clé (y compris ceux en cours)."""
+		task = self._rel_cache.get(key)
+		if task is None:
+			task = self._rel_cache[key] = asyncio.create_task(fetch())
+		# shield : annuler une stratégie ne doit pas annuler la requête qu'attendent les autres
+		return await asyncio.shield(task)
+
+	@staticmethod
+	def _params_key(params: EndpointParams) -> tuple:
+		return (tuple(sorted(params.types_ids or ())), params.min_weight, params.limit)
+
+	async def _cached_get_relations(self, term: Term, params: EndpointParams, inverted=False) -> RelationResult:
+		key = ("to" if inverted else "from", term.id, *self._params_key(params))
+		return await self._cached(key, lambda: term.get_relations(inverted=inverted, params=params))
+
+	async def _final_rel_index(self, term: Term, final_rel_id: int, inverted=False) -> tuple[dict[int, Relation], bool]:
+		"""
+		Relations `final_rel_id` partant de `term` (ou y arrivant si `inverted`), indexées par le terme à l'autre bout.
+		Un seul appel remplace les `relation_with` faits pour chaque voisin.
+		Renvoie aussi si l'index est tronqué (FINAL_INDEX_LIMIT atteint) : un terme absent peut alors quand même être relié.
+		"""
+		async def build():
+			result = await self._cached_get_relations(term, _make_params((final_rel_id,), limit=FINAL_INDEX_LIMIT), inverted=inverted)
+			truncated = len(result.relations) >= FINAL_INDEX_LIMIT
+			if inverted:
+				return {rel.node1: rel for rel in result.relations}, truncated
+			return {rel.node2: rel for rel in result.relations}, truncated
 
-	def normalize_and_score(self, inferences: list[Inference]):
-		all_weights1 = [inf.weight1 for inf in inferences]
-		all_weights2 = [inf.weight2 for inf in inferences]
-
-		max_w1 = max(all_weights1)
-		max_w2 = max(all_weights2)
-
-		for inf in inferences:
-			norm_w1 = inf.weight1 / max_w1 if max_w1 else 0
-			norm_w2 = inf.weight2 / max_w2 if max_w2 else 0
-
-			# Moyenne harmonique (évite division par 0)
-			if norm_w1 > 0 and norm_w2 > 0:
-				inf.score = harmonic_mean([norm_w1, norm_w2])
-			else:
-				inf.score = 0.0
-
-			annotation_weight = inf.annotation_weight1 * inf.annotation_weight2
-			inf.score *= annotation_weight
-
-	async def inference_by_generalization(self, sujet: Term, objet: Term, final_rel_id: int):
-		params = self.default_params.copy()
-		params.types_ids = [self.api.get_relation_type_by_name("r_isa").id]
-
-		r_isa_rel = await objet.get_relations(params=params)
-		r_isa_rel = sorted(r_isa_rel.relations, key=lambda r: r.w, reverse=True)
+		return await self._cached(("index", term.id, final_rel_id, inverted), build)
 
-		params = self.default_params.copy()
-		params.types_ids = [final_rel_id]
-		
+	async def _resolve_outside_index(self, middle_rels: list[Relation], last: Term, final_rel_id: int,
+									 from_objet: bool) -> list[tuple[Relation, Relation]]:
+		"""
+		Chemins dont la relation finale n'est pas dans l'index tronqué (terme très connecté) :
+		un relation_with par intermédiaire, lancés ensemble par fetch_relations_bulk.
+		"""
+		if not middle_rels:
+			return []
+		pairs = [
+			(last.name, rel.objet.name) if from_objet else (rel.objet.name, last.name)
+			for rel in middle_rels
+		]
+		results = await self.api.fetch_relations_bulk(
+			pairs, params=_make_params((final_rel_id,)), return_exceptions=True, semaphore=self._sem,
+		)
+		# Comme avant l'index : une paire en erreur ou sans relation est simplement ignorée
+		return [
+			(rel, result.relations[0])
+			for rel, result in zip(middle_rels, results)
+			if not isinstance(result, Exception) and result.relations
+		]
 
-		async def get_final_rel(rel):
-			await rel.get_annotation(self.api)
-			rel_annotation_weight = rel.get_annotation_weight()
+	async def _fetch_annotations(self, relations: list[Relation]):
+		"""Récupère en un seul lot les annotations pas encore demandées pendant ce run, puis les attache aux relations."""
+		missing = [rel.id for rel in relations if ("annotation", rel.id) not in self._rel_cache]
+		if missing:
+			task = asyncio.create_task(self.api.fetch_annotations_bulk(missing, semaphore=self._sem))
+			for rel_id in missing:
+				self._rel_cache[("annotation", rel_id)] = task
+
+		for rel in relations:
+			annotations = await asyncio.shield(self._rel_cache[("annotation", rel.id)])
+			if annotations.get(rel.id):
+				rel.annotation = annotations[rel.id]
+
+	@staticmethod
+	def normalize_and_score(inferences: list[Inference]) -> np.ndarray:
+		"""Calcule le score de chaque inférence, le reporte sur l'objet et renvoie le tableau des scores."""
+		# Une ligne par inférence : weight1, weight2, annotation_weight1, annotation_weight2
+		weights = np.array(
+			[(inf.weight1, inf.weight2, inf.annotation_weight1, inf.annotation_weight2) for inf in inferences],
+			dtype=np.float64,
+		)
+		max_w = weights[:, :2].max(axis=0)
+		norm = np.divide(weights[:, :2], max_w, out=np.zeros_like(weights[:, :2]), where=max_w != 0)
+		norm_w1, norm_w2 = norm[:, 0], norm[:, 1]
+
+		# Moyenne harmonique, 0 si l'un des poids normalisés n'est pas positif (évite division par 0)
+		scores = np.zeros_like(norm_w1)
+		np.divide(2 * norm_w1 * norm_w2, norm_w1 + norm_w2, out=scores, where=(norm_w1 > 0) & (norm_w2 > 0))
+		scores *= weights[:, 2] * weights[:, 3]
+
+		for inf, score in zip(inferences, scores.tolist()):
+			inf.score = score
+		return scores
+
+	@staticmethod
+	def top_k(inferences: list[Inference], scores: np.ndarray, k: int) -> list[Inference]:
+		"""Les `k` meilleures inférences par score décroissant, sans trier celles qui sont écartées."""
+		if k < len(inferences):
+			top_idx = np.argpartition(-scores, k)[:k]
+		else:
+			top_idx = np.arange(len(inferences))
+		top_idx = top_idx[np.argsort(-scores[top_idx], kind="stable")]
+		return [inferences[i] for i in top_idx]
+
+	@staticmethod
+	def _group_by_type(relations: list[Relation]) -> dict[int, list[Relation]]:
+		buckets = {}
+		for rel in relations:
+			buckets.setdefault(rel.type, []).append(rel)
+		return buckets
+
+	async def _infer_via(self, sujet: Term, objet: Term, middle_rel_id: int, final_rel_id: int, label: str,
+						 from_objet=False, preloaded_rels: list[Relation] | None = None) -> list[Inference]:
+		"""
+		Inférence en deux sauts passant par un terme intermédiaire X.
+		- par défaut : sujet -middle-> X puis X -final-> objet
+		- from_objet : objet -middle-> X puis sujet -final-> X
 
-			result = await sujet.relation_with(rel.objet, params)
-			if result.relations:
-				final_relation = result.relations[0]
-				await final_relation.get_annotation(self.api)
-				final_annotation_weight = final_relation.get_annotation_weight()
-		
-				return Inference(
-					sujet=sujet.name,
-					gen=rel.objet.name,
-					objet=objet.name,
-					weight1=rel.w,
-					weight2=final_relation.w,
-					t="isa",
-					rel=final_relation.relation_type.name,
-
-					annotation_weight1=rel_annotation_weight,
-					annotation_weight2=final_annotation_weight,
-				)
-			return None
-
-		tasks = [get_final_rel(rel) for rel in r_isa_rel]
-		results = await asyncio.gather(*tasks, return_exceptions=True)
-		
-		inferences = [r for r in results if r is not None and not isinstance(r, Exception)]
-		
-		return inferences
+		`preloaded_rels` permet de fournir les relations du premier saut déjà récupérées.
+		"""
+		first, last = (objet, sujet) if from_objet else (sujet, objet)
+		if preloaded_rels is None:
+			preloaded_rels = (await self._cached_get_relations(first, _make_params((middle_rel_id,)))).relations
+		if not preloaded_rels:
+			return []
+
+		final_index, truncated = await self._final_rel_index(last, final_rel_id, inverted=not from_objet)
+
+		paths = [(rel, final_index[rel.objet.id]) for rel in preloaded_rels if rel.objet.id in final_index]
+		if truncated:
+			paths += await self._resolve_outside_index(
+				[rel for rel in preloaded_rels if rel.objet.id not in final_index], last, final_rel_id, from_objet,
+			)
+		if not paths:
+			return []
+		# Coupe après le filtre : seuls les chemins qui se ferment comptent pour max_branch
+		paths = heapq.nlargest(self.max_branch, paths, key=lambda path: path[0].w)
+		await self._fetch_annotations([relation for path in paths for relation in path])
+
+		return [
+			Inference(
+				sujet=sujet.name,
+				gen=rel.objet.name,
+				objet=objet.name,
+				weight1=rel.w,
+				weight2=final_relation.w,
+				t=label,
+				rel=final_relation.relation_type.name,
+
+				annotation_weight1=rel.get_annotation_weight(),
+				annotation_weight2=final_relation.get_annotation_weight(),
+			)
+			for rel, final_relation in paths
+		]
 
-	async def inference_by_generalization_inverted(self, sujet: Term, objet: Term, final_rel_id: int):
-		params = self.default_params.copy()
-		params.types_ids = [self.api.get_relation_type_by_name("r_isa").id]
+	async def inference_by_generalization(self, sujet: Term, objet: Term, final_rel_id: int, preloaded_rels: list[Relation] | None = None):
+		return await self._infer_via(sujet, objet, self._isa_id, final_rel_id, "isa", from_objet=True, preloaded_rels=preloaded_rels)
 
-		r_isa_rel = await sujet.get_relations(params=params)
-		r_isa_rel = sorted(r_isa_rel.relations, key=lambda r: r.w, reverse=True)
+	async def inference_by_generalization_inverted(self, sujet: Term, objet: Term, final_rel_id: int, preloaded_rels: list[Relation] | None = None):
+		return await self._infer_via(sujet, objet, self._isa_id, final_rel_id, "isa", preloaded_rels=preloaded_rels)
 
-		params = self.default_params.copy()
-		params.types_ids = [final_rel_id]
-		
+	async def inference_by_specialization(self, sujet: Term, objet: Term, final_rel_id: int, preloaded_rels: list[Relation] | None = None):
+		return await self._infer_via(sujet, objet, self._hypo_id, final_rel_id, "hypo", preloaded_rels=preloaded_rels)
 
-		async def get_final_rel(rel):
-			await rel.get_annotation(self.api)
-			rel_annotation_weight = rel.get_annotation_weight()
+	async def inference_by_transitivity(self, sujet: Term, objet: Term, final_rel_id: int, preloaded_rels: list[Relation] | None = None):
+		# Cas particulier : le premier saut est la relation cherchée elle-même
+		return await self._infer_via(sujet, objet, final_rel_id, final_rel_id, "transitivity", preloaded_rels=preloaded_rels)
 
-			result = await rel.objet.relation_with(objet, params)
-			if result.relations:
-				final_relation = result.relations[0]
-				await final_relation.get_annotation(self.api)
-				final_annotation_weight = final_relation.get_annotation_weight()
-		
-				return Inference(
-					sujet=sujet.name,
-					gen=rel.objet.name,
-					objet=objet.name,
-					weight1=rel.w,
-					weight2=final_relation.w,
-					t="isa",
-					rel=final_relation.relation_type.name,
-
-					annotation_weight1=rel_annotation_weight,
-					annotation_weight2=final_annotation_weight,
-				)
-			return None
-
-		tasks = [get_final_rel(rel) for rel in r_isa_rel]
-		results = await asyncio.gather(*tasks, return_exceptions=True)
-		
-		inferences = [r for r in results if r is not None and not isinstance(r, Exception)]
-		
-		return inferences
-	
-	async def inference_by_specialization(self, sujet: Term, objet: Term, final_rel_id: int):
-		params = self.default_params.copy()
-		params.types_ids = [self.api.get_relation_type_by_name("r_hypo").id]
-
-		r_hypo_rel = await sujet.get_relations(params=params)
-		r_hypo_rel = sorted(r_hypo_rel.relations, key=lambda r: r.w, reverse=True)
-		
-		params = self.default_params.copy()
-		params.types_ids = [final_rel_id]
-		
-		async def get_final_rel(rel):
-			await rel.get_annotation(self.api)
-			rel_annotation_weight = rel.get_annotation_weight()
-
-			result = await rel.objet.relation_with(objet, params)
-			if result.relations:
-				final_relation = result.relations[0]
-				await final_relation.get_annotation(self.api)
-				final_annotation_weight = final_relation.get_annotation_weight()
-
-				return Inference(
-					sujet=sujet.name,
-					gen=rel.objet.name,
-					objet=objet.name,
-					weight1=rel.w,
-					weight2=final_relation.w,
-					t="hypo",
-					rel=final_relation.relation_type.name,
-
-					annotation_weight1=rel_annotation_weight,
-					annotation_weight2=final_annotation_weight,
-				)
-			return None
-
-		tasks = [get_final_rel(rel) for rel in r_hypo_rel]
-		results = await asyncio.gather(*tasks, return_exceptions=True)
-		
-		inferences = [r for r in results if r is not None and not isinstance(r, Exception)]
-		
-		return inferences
-
-	async def inference_by_transitivity(self, sujet: Term, objet: Term, final_rel_id: int):
-		params = self.default_params.copy()
-		params.types_ids = [final_rel_id]
-
-		r_trans_rel = await sujet.get_relations(params=params)
-		r_trans_rel = sorted(r_trans_rel.relations, key=lambda r: r.w, reverse=True)
-		
-		async def get_final_rel(rel):
-			await rel.get_annotation(self.api)
-			rel_annotation_weight = rel.get_annotation_weight()
-
-			result = await rel.objet.relation_with(objet, params)
-			if result.relations:
-				final_relation = result.relations[0]
-				await final_relation.get_annotation(self.api)
-				final_annotation_weight = final_relation.get_annotation_weight()
-				
-				return Inference(
-					sujet=sujet.name,
-					gen=rel.objet.name,
-					objet=objet.name,
-					weight1=rel.w,
-					weight2=final_relation.w,
-					t="transitivity",
-					rel=final_relation.relation_type.name,
-
-					annotation_weight1=rel_annotation_weight,
-					annotation_weight2=final_annotation_weight,
-				)
-			return None
-
-		tasks = [get_final_rel(rel) for rel in r_trans_rel]
-		results = await asyncio.gather(*tasks, return_exceptions=True)
-		
-		inferences = [r for r in results if r is not None and not isinstance(r, Exception)]
-		
-		return inferences
-	
-	async def inference_by_synonymy(self, sujet: Term, objet: Term, final_rel_id: int):
-		params = self.default_params.copy()
-		params.types_ids = [self.api.get_relation_type_by_name("r_syn").id]
-
-		r_syn_rel = await sujet.get_relations(params=params)
-		r_syn_rel = sorted(r_syn_rel.relations, key=lambda r: r.w, reverse=True)
-		
-		params = self.default_params.copy()
-		params.types_ids = [final_rel_id]
-		
-		async def get_final_rel(middle_rel):
-			await middle_rel.get_annotation(self.api)
-			rel_annotation_weight = middle_rel.get_annotation_weight()
-
-			result = await middle_rel.objet.relation_with(objet, params)
-			if result.relations:
-				final_relation = result.relations[0]
-				await final_relation.get_annotation(self.api)
-				final_annotation_weight = final_relation.get_annotation_weight()
-
-				return Inference(
-					sujet=sujet.name,
-					gen=middle_rel.objet.name,
-					objet=objet.name,
-					weight1=middle_rel.w,
-					weight2=final_relation.w,
-					t="syn",
-					rel=final_relation.relation_type.name,
-
-					annotation_weight1=rel_annotation_weight,
-					annotation_weight2=final_annotation_weight,
-				)
-			return None
-
-		tasks = [get_final_rel(rel) for rel in r_syn_rel]
-		results = await asyncio.gather(*tasks, return_exceptions=True)
-		
-		inferences = [r for r in results if r is not None and not isinstance(r, Exception)]
-		
-		return inferences
+	async def inference_by_synonymy(self, sujet: Term, objet: Term, final_rel_id: int, preloaded_rels: list[Relation] | None = None):
+		return await self._infer_via(sujet, objet, self._syn_id, final_rel_id, "syn", preloaded_rels=preloaded_rels)
 
 	async def run_all_inferences(self, sujet, objet, rel_id):
 		sujet.api = self.api
 		objet.api = self.api
 
-		tasks = [
-			self.inference_by_generalization(sujet, objet, rel_id),
-			self.inference_by_generalization_inverted(sujet, objet, rel_id),
-			self.inference_by_specialization(sujet, objet, rel_id),
-			self.inference_by_transitivity(sujet, objet, rel_id),
-			self.inference_by_synonymy(sujet, objet, rel_id),
+		# Premiers sauts de toutes les stratégies en deux requêtes seulement, triées ensuite par type
+		sujet_types = tuple(dict.fromkeys([self._isa_id, self._hypo_id, self._syn_id, rel_id]))
+		batch_limit = DEFAULT_LIMIT * len(sujet_types)
+		sujet_rels, objet_rels = await asyncio.gather(
+			self._first_hop(self._cached_get_relations(sujet, _make_params(sujet_types, limit=batch_limit))),
+			self._first_hop(self._cached_get_relations(objet, _make_params((self._isa_id,)))),
+		)
+		if not sujet_rels and not objet_rels:
+			return []
+
+		if len(sujet_rels) < batch_limit:
+			# Lot complet : chaque type garde ses DEFAULT_LIMIT plus fortes relations, comme s'il avait été demandé seul
+			sujet_buckets = {
+				type_id: heapq.nlargest(DEFAULT_LIMIT, rels, key=attrgetter("w"))
+				for type_id, rels in self._group_by_type(sujet_rels).items()
+			}
+		else:
+			# Lot plein : un type dense a pu évincer les autres, chaque stratégie refait alors sa propre requête
+			sujet_buckets = None
+
+		def first_hop(type_id):
+			return None if sujet_buckets is None else sujet_buckets.get(type_id, [])
+
+		strategies = [
+			self.inference_by_generalization(sujet, objet, rel_id, preloaded_rels=objet_rels),
+			self.inference_by_generalization_inverted(sujet, objet, rel_id, preloaded_rels=first_hop(self._isa_id)),
+			self.inference_by_specialization(sujet, objet, rel_id, preloaded_rels=first_hop(self._hypo_id)),
+			self.inference_by_transitivity(sujet, objet, rel_id, preloaded_rels=first_hop(rel_id)),
+			self.inference_by_synonymy(sujet, objet, rel_id, preloaded_rels=first_hop(self._syn_id)),
 		]
-		
-		results = await asyncio.gather(*tasks, return_exceptions=True)
-		
-		inferences = []
-		for result in results:
-			if isinstance(result, Exception):
-				print(f"Erreur: {result}")
-			else:
-				inferences.extend(result)
-
-		return inferences
+
+		# Une stratégie en échec est journalisée sans annuler les autres (cf. _run_strategy)
+		async with asyncio.TaskGroup() as tg:
+			tasks = [tg.create_task(self._run_strategy(strategy)) for strategy in strategies]
+
+		return [inference for task in tasks for inference in task.result()]
+
+	@staticmethod
+	async def _first_hop(fetch) -> list[Relation]:
+		"""Comme _run_strategy : une requête groupée en échec est journalisée et ses premiers sauts sont vus comme vides."""
+		try:
+			return (await fetch).relations
+		except Exception:
+			_log.exception("Erreur pendant la récupération des premiers sauts")
+			return []
+
+	@staticmethod
+	async def _run_strategy(strategy) -> list[Inference]:
+		try:
+			return await strategy
+		except Exception:
+			_log.exception("Erreur pendant une stratégie d'inférence")
+			return []
 	
 	async def run(self, sujet_name:str, relation_name:str, objet_name:str) -> None:
 		"""Run the inference process."""
+		self._rel_cache = {}
 		try:
-			sujet, objet = (await self.api.fetch_term_by_name(sujet_name), await self.api.fetch_term_by_name(objet_name))
+			sujet, objet = await asyncio.gather(self.api.fetch_term_by_name(sujet_name), self.api.fetch_term_by_name(objet_name))
 			rel_id = self.api.get_relation_type_by_name(relation_name).id
 
 		except Exception as e:
@@ -311,8 +310,8 @@ class RelationInferer:
 			self.logger.render_inferences(inferences)
 			return
 
-		self.normalize_and_score(inferences)
-		inferences = sorted(inferences, key=lambda r: r.score, reverse=True)[:self.limit]
+		# Calcul hors de la boucle asyncio pour ne pas bloquer les autres commandes du bot
+		inferences = await asyncio.to_thread(_score_and_top_k, inferences, self.limit)
 		
 		self.logger.render_inferences(inferences)
 	
@@ -323,3 +322,9 @@ class RelationInferer:
 		# TODO : [x] Faire un meilleur formatage
 		# TODO : [x] 2 type de logger un pour le bot, l'autre pour le cli
 		# TODO : [x] Mettre sur github
+
+
+def _score_and_top_k(inferences: list[Inference], limit: int) -> list[Inference]:
+	"""Score les inférences et renvoie les `limit` meilleures."""
+	scores = RelationInferer.normalize_and_score(inferences)
+	return RelationInferer.top_k(inferences, scores, limit)
@@ -1,13 +1,26 @@
 from __future__ import annotations
-from rich import print as rprint
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field, fields
 from typing import List, Optional
 from datetime import timedelta
-import copy
+from collections import OrderedDict
+from functools import lru_cache, partial
+from operator import attrgetter, itemgetter
+from pathlib import Path
+from types import MappingProxyType
+from urllib.parse import quote
+import asyncio
+import hashlib
+import logging
+import time
+import orjson
+from aiohttp import ClientTimeout, TCPConnector
 from aiohttp_client_cache import CachedSession, FileBackend
+from yarl import URL
 
+_log = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class Term:
 	id: int
 	name: str
@@ -34,61 +47,85 @@ class Term:
 			raise RuntimeError("API instance not set on Term object.")
 		return await self.api.fetch_relation(self.name, inverted, params)
 
-@dataclass
+_ENDPOINT_PARAMS_LIST_FIELDS = ("types_ids", "not_types_ids", "relation_fields", "node_fields")
+
+@dataclass(frozen=True, slots=True)
 class EndpointParams:
-	types_ids: Optional[List[int]] = None
-	not_types_ids: Optional[List[int]] = None
+	"""
+	Paramètres de requête, immuables : une même instance peut être partagée entre les appels
+	et sa version requête n'est calculée qu'une fois (voir _query_params).
+	Les listes passées au constructeur sont converties en tuples.
+	"""
+	types_ids: Optional[tuple[int, ...]] = None
+	not_types_ids: Optional[tuple[int, ...]] = None
 	min_weight: Optional[int] = None
 	max_weight: Optional[int] = None
-	relation_fields: Optional[List[str]] = None
-	node_fields: Optional[List[str]] = None
+	relation_fields: Optional[tuple[str, ...]] = None
+	node_fields: Optional[tuple[str, ...]] = None
 	limit: Optional[int] = 0
 	without_nodes: bool = False
 
+	def __post_init__(self):
+		for name in _ENDPOINT_PARAMS_LIST_FIELDS:
+			value = getattr(self, name)
+			if value is not None and type(value) is not tuple:
+				object.__setattr__(self, name, tuple(value))
+
 	def copy(self) -> EndpointParams:
-		return copy.deepcopy(self)
+		# L'instance est immuable, elle peut être partagée telle quelle
+		return self
 
-	def to_query_params(self):
-		def serialize(value):
-			if isinstance(value, list):
-				return ",".join(map(str, value))
-			elif isinstance(value, bool):
-				return str(value).lower()
-			return value
+	def to_query_params(self) -> MappingProxyType:
+		"""Paramètres au format de l'API, en lecture seule : le résultat est mis en cache par instance."""
+		return _query_params(self)
 
-		return {
-			key: serialize(value)
-			for key, value in asdict(self).items()
-			if value is not None and not (isinstance(value, bool) and value is False)
-		}
+_ENDPOINT_PARAMS_FIELDS = tuple(f.name for f in fields(EndpointParams))
+
+@lru_cache(maxsize=1024)
+def _query_params(params: EndpointParams) -> MappingProxyType:
+	# Parcours direct des champs plutôt que asdict(), qui recopie tout l'objet à chaque appel
+	query = {}
+	for name in _ENDPOINT_PARAMS_FIELDS:
+		value = getattr(params, name)
+		if value is None or value is False:
+			continue
+		kind = type(value)
+		if kind is tuple:
+			query[name] = ",".join(map(str, value))
+		elif kind is bool:
+			query[name] = "true"
+		else:
+			query[name] = value
+	return MappingProxyType(query)
 
-@dataclass
+@dataclass(slots=True)
 class RelationResult:
 	nodes: List[Term]
 	relations: List[Relation]
 
 	def _enrich_relations(self, relation_types: dict[int, RelationType]):
-		node_map = {term.id: term for term in self.nodes}
+		# Méthodes liées en variables locales : évite de les rechercher à chaque tour de boucle
+		node_of = dict(zip(map(attrgetter("id"), self.nodes), self.nodes)).__getitem__
+		type_of = relation_types.__getitem__
 		for rel in self.relations:
-			rel.sujet = node_map[rel.node1]
-			rel.objet = node_map[rel.node2]
-			rel.relation_type = relation_types[rel.type]
+			rel.sujet = node_of(rel.node1)
+			rel.objet = node_of(rel.node2)
+			rel.relation_type = type_of(rel.type)
 			
 	@staticmethod
 	def from_dict(data: dict, api: JdmApi):
 		nodes = [Term(**n, api=api) for n in data["nodes"]]
-		relations = [Relation(**r) for r in data["relations"]]
+		# Construction positionnelle : itemgetter (en C) extrait les champs sans passer par **kwargs
+		relations = [Relation(*row) for row in map(_RELATION_ROW, data["relations"])]
 		relation_result = RelationResult(nodes=nodes, relations=relations)
 		relation_result._enrich_relations(api.relation_types)
 		return relation_result
 	
 	def __str__(self):
-		p = ""
-		for rel in self.relations:
-			p+= f"{rel.sujet.name} ({rel.relation_type.gpname}) {rel.objet.name} | {rel.w} \n"
-		return p
+		# Une ligne par relation, au format de Relation.__str__
+		return "".join(f"{rel} \n" for rel in self.relations)
 	
-@dataclass
+@dataclass(slots=True)
 class Relation:
 	id: int
 	node1: int
@@ -139,7 +176,9 @@ class Relation:
 			return 1
 		return weights[self.annotation]
 
-@dataclass
+_RELATION_ROW = itemgetter("id", "node1", "node2", "type", "w")
+
+@dataclass(slots=True)
 class RelationType:
 	id: int
 	name: str
@@ -156,77 +195,198 @@ class TermNotFoundError(Exception):
         self.status_code = status_code
         super().__init__(f"Terme '{term_name}' non trouvé (code: {status_code})")
 
+class JdmApiError(Exception):
+    """Exception levée quand l'API répond avec un code d'erreur inattendu"""
+    def __init__(self, endpoint: URL | str, status_code: int):
+        self.endpoint = endpoint
+        self.status_code = status_code
+        super().__init__(f"Erreur de l'API sur '{endpoint}' (code: {status_code})")
+
+CACHE_VERSION = 1
+RELATION_TYPES_TTL = timedelta(days=7)
+
+class TTLCache:
+	"""Cache LRU en mémoire dont les entrées expirent après `ttl` secondes."""
+	def __init__(self, maxsize: int = 4096, ttl: float = 3600):
+		self.maxsize = maxsize
+		self.ttl = ttl
+		self.hits = 0
+		self.misses = 0
+		self._entries: OrderedDict = OrderedDict()
+
+	def get(self, key, default=None):
+		entry = self._entries.get(key)
+		if entry is None or entry[1] < time.monotonic():
+			if entry is not None:
+				del self._entries[key]
+			self.misses += 1
+			return default
+		self._entries.move_to_end(key)
+		self.hits += 1
+		return entry[0]
+
+	def set(self, key, value):
+		self._entries[key] = (value, time.monotonic() + self.ttl)
+		self._entries.move_to_end(key)
+		if len(self._entries) > self.maxsize:
+			self._entries.popitem(last=False)
+
+	def pop(self, key, default=None):
+		entry = self._entries.pop(key, None)
+		return default if entry is None else entry[0]
+
+	def clear(self):
+		self._entries.clear()
+		self.hits = 0
+		self.misses = 0
+
+	def stats(self) -> dict:
+		return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
 class JdmApi:
-	def __init__(self, base_url="https://jdm-api.demo.lirmm.fr/v0"):
-		self._base_url = base_url
-		self._session = None
-		self.relation_types = None
+	# Partagés par toutes les instances : une seule session HTTP (et son pool de connexions)
+	# et une seule liste de types de relations pour toute la vie de l'application
+	_session: Optional[CachedSession] = None
+	relation_types: Optional[dict[int, RelationType]] = None
+	_relation_types_by_name: dict[str, RelationType] = {}
+
+	def __init__(self, base_url="https://jdm-api.demo.lirmm.fr/v0", cache_size=4096, cache_ttl=3600):
+		self._base_url = URL(base_url)
+		# Même convention que le cache HTTP (CACHE_VERSION), plus l'URL de base : deux API différentes ne partagent pas le fichier
+		url_hash = hashlib.sha1(str(self._base_url).encode()).hexdigest()[:12]
+		self._relation_types_file = Path(f"database/relation_types_v{CACHE_VERSION}_{url_hash}.json")
+		# Résultats déjà parsés (ou requêtes en cours), partagés entre les runs tant que l'instance vit
+		self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
 
 	async def __aenter__(self):
-		# Cache avec aiohttp
-		cache = FileBackend(
-			cache_name='database/jdm_api_cache',
-			expire_after=timedelta(days=2)
-		)
-		self._session = CachedSession(cache=cache)
-		self.relation_types = await self.fetch_relations_types()
+		await self._ensure_session()
 		return self
 
 	async def __aexit__(self, exc_type, exc_val, exc_tb):
-		if self._session:
-			await self._session.close()
+		# La session est partagée avec les autres instances : elle n'est fermée que par JdmApi.aclose()
+		pass
+
+	async def _ensure_session(self):
+		if JdmApi._session is None or JdmApi._session.closed:
+			# Cache avec aiohttp, persistant sur disque entre deux lancements.
+			# Le nom porte CACHE_VERSION : l'incrémenter invalide proprement les anciennes réponses.
+			cache = FileBackend(
+				cache_name=f'database/jdm_api_cache_v{CACHE_VERSION}',
+				expire_after=timedelta(days=2)
+			)
+			# Connexions gardées ouvertes et réutilisées entre les requêtes (évite DNS + TLS à chaque appel)
+			connector = TCPConnector(limit=64, limit_per_host=16, ttl_dns_cache=600, keepalive_timeout=75)
+			JdmApi._session = CachedSession(cache=cache, connector=connector, timeout=ClientTimeout(total=30))
+		if JdmApi.relation_types is None:
+			JdmApi.relation_types = await self.fetch_relations_types()
+			# Index par name et par gpname ; en cas de doublon, le premier type rencontré l'emporte
+			JdmApi._relation_types_by_name = {}
+			for relation_type in JdmApi.relation_types.values():
+				JdmApi._relation_types_by_name.setdefault(relation_type.name, relation_type)
+				JdmApi._relation_types_by_name.setdefault(relation_type.gpname, relation_type)
 
-	def _getEndpoint(self, endpoint: str):
-		return f"{self._base_url}/{endpoint}"
+	@classmethod
+	async def aclose(cls):
+		"""Ferme la session HTTP partagée, à appeler à l'arrêt de l'application."""
+		if JdmApi._session is not None:
+			await JdmApi._session.close()
+			JdmApi._session = None
 
-	async def _fetch(self, endpoint: str, params=None):
-		async with self._session.get(self._getEndpoint(endpoint), params=params) as response:
-			return response
+	async def clear_cache(self):
+		"""Vide le cache mémoire et le cache HTTP sur disque : les requêtes suivantes repartent vers JDM."""
+		self.cache.clear()
+		if JdmApi._session is not None and not JdmApi._session.closed:
+			# Pas de FileBackend.clear() : il supprime le dossier sous la base SQLite des redirections, encore ouverte.
+			# Les réponses sont donc effacées une à une, puis les redirections.
+			http_cache = JdmApi._session.cache
+			await http_cache.responses.bulk_delete({key async for key in http_cache.responses.keys()})
+			await http_cache.redirects.clear()
+
+	def _getEndpoint(self, *segments: str) -> URL:
+		# Chaque segment est encodé ici, une seule fois, y compris ses "/" (ex: "km/h") ; aiohttp utilise l'URL telle quelle
+		return self._base_url.joinpath(*(quote(segment, safe="") for segment in segments), encoded=True)
+
+	async def _fetch(self, endpoint: URL, params=None) -> tuple[int, bytes]:
+		"""
+		Retourne (code, corps brut). Le corps est lu dans le `async with` : une fois sorti,
+		la connexion est rendue au pool et la réponse ne doit plus être lue.
+		"""
+		async with self._session.get(endpoint, params=params) as response:
+			return response.status, await response.read()
+
+	@staticmethod
+	def _json(body: bytes):
+		# orjson est bien plus rapide que le json de la bibliothèque standard sur les grosses réponses
+		return orjson.loads(body)
+
+	async def _single_flight(self, key, load):
+		"""
+		Sert `key` depuis le cache. Le cache garde la tâche et non le résultat : des appels concurrents
+		sur une même clé attendent la même requête au lieu d'en lancer chacun une.
+		"""
+		task = self.cache.get(key)
+		if task is None:
+			task = asyncio.create_task(load())
+			task.add_done_callback(lambda t: self._forget_failure(key, t))
+			self.cache.set(key, task)
+		# shield : un appelant annulé arrête d'attendre sans annuler la requête partagée avec les autres
+		return await asyncio.shield(task)
+
+	def _forget_failure(self, key, task: asyncio.Task):
+		# Une requête en échec n'est pas mise en cache, le prochain appel réessaiera
+		if task.cancelled() or task.exception() is not None:
+			self.cache.pop(key)
 
 	async def fetch_term_by_name(self, term: str) -> Term | None:
 		"""Version async de fetch_term_by_name"""
-		response = await self._fetch(f"node_by_name/{term}")
-		if response.status == 200:
-			data = await response.json()
+		endpoint = self._getEndpoint("node_by_name", term)
+		return await self._single_flight(endpoint, lambda: self._load_term(endpoint, term))
+
+	async def _load_term(self, endpoint: URL, term: str) -> Term:
+		status, body = await self._fetch(endpoint)
+		if status == 200:
+			data = self._json(body)
 			return Term(**data, api=self)
-		elif response.status == 404:
-			raise TermNotFoundError(term, response.status)
-		elif response.status == 500:
-			raise TermNotFoundError(term, response.status)
+		elif status == 404:
+			raise TermNotFoundError(term, status)
+		elif status == 500:
+			raise TermNotFoundError(term, status)
 		else:
-			print(f"Erreur lors de la récupération du terme '{term}' (code {response.status})")
-			raise TermNotFoundError(term, response.status)
+			_log.error("Erreur lors de la récupération du terme '%s' (code %s)", term, status)
+			raise TermNotFoundError(term, status)
+
+	async def warm_up(self, term_names: List[str]):
+		"""Précharge des termes dans les caches, en ignorant ceux introuvables."""
+		await asyncio.gather(*(self.fetch_term_by_name(name) for name in term_names), return_exceptions=True)
 
 	async def fetch_relation_between(self, sujet, objet, params: Optional[EndpointParams] = None) -> RelationResult:
 		"""Version async de fetch_relation_between"""
-		endpoint = f"relations/from/{sujet}/to/{objet}"
+		endpoint = self._getEndpoint("relations", "from", sujet, "to", objet)
 		query_params = params.to_query_params() if params else {}
-
-		response = await self._fetch(endpoint, params=query_params)
-		if response.status == 200:
-			data = await response.json()
-			return RelationResult.from_dict(data, api=self)
-		else:
-			print(f"Erreur lors de la récupération des relations '{sujet}' & '{objet}' (code {response.status})")
-			response.raise_for_status()
+		key = (endpoint, frozenset(query_params.items()))
+		return await self._single_flight(key, lambda: self._load_relations(endpoint, query_params, f"'{sujet}' & '{objet}'"))
 
 	async def fetch_relation(self, term, inverted=False, params: Optional[EndpointParams] = None) -> RelationResult:
 		"""Version async de fetch_relation"""
-		endpoint = f"relations/to/{term}" if inverted else f"relations/from/{term}"
+		endpoint = self._getEndpoint("relations", "to" if inverted else "from", term)
 		query_params = params.to_query_params() if params else {}
+		key = (endpoint, frozenset(query_params.items()))
+		return await self._single_flight(key, lambda: self._load_relations(endpoint, query_params, f"de '{term}'"))
 
-		response = await self._fetch(endpoint, params=query_params)
-		if response.status == 200:
-			data = await response.json()
+	async def _load_relations(self, endpoint: URL, query_params: dict, description: str) -> RelationResult:
+		status, body = await self._fetch(endpoint, params=query_params)
+		if status == 200:
+			data = self._json(body)
 			return RelationResult.from_dict(data, api=self)
 		else:
-			print(f"Erreur lors de la récupération des relations de '{term}' (code {response.status})")
-			response.raise_for_status()
+			_log.error("Erreur lors de la récupération des relations %s (code %s)", description, status)
+			raise JdmApiError(endpoint, status)
 
 	async def fetch_relation_anotation(self, relation_id):
-		response = await self._fetch(f"relations/from/:r{relation_id}")
-		if response.status == 200:
-			data = await response.json()
+		endpoint = self._getEndpoint("relations", "from", f":r{relation_id}")
+		status, body = await self._fetch(endpoint)
+		if status == 200:
+			data = self._json(body)
 			nodes = data.get("nodes", [])
 
 			if not nodes:
@@ -234,42 +394,94 @@ class JdmApi:
 			
 			max_node = max(nodes, key=lambda n: n.get("w", 0))
 			return max_node.get("name")
-		elif response.status == 404:
+		elif status == 404:
 			return None
-		elif response.status == 500:
+		elif status == 500:
 			return None
 		else:
-			print(f"Erreur lors de la récupération de l'annotation de '{relation_id}' (code {response.status})")
-			response.raise_for_status()
+			_log.error("Erreur lors de la récupération de l'annotation de '%s' (code %s)", relation_id, status)
+			raise JdmApiError(endpoint, status)
+
+	@staticmethod
+	async def _gather_bounded(calls, semaphore: asyncio.Semaphore, return_exceptions=False) -> list:
+		"""Lance tous les appels en parallèle, sans dépasser le nombre de places du sémaphore, et garde l'ordre des résultats."""
+		async def bounded(call):
+			async with semaphore:
+				return await call()
+
+		return await asyncio.gather(*(bounded(call) for call in calls), return_exceptions=return_exceptions)
+
+	async def fetch_relations_bulk(self, pairs: List[tuple[str, str]], params: Optional[EndpointParams] = None, concurrency=20,
+								   return_exceptions=False, semaphore: Optional[asyncio.Semaphore] = None) -> List[RelationResult]:
+		"""
+		Version groupée de fetch_relation_between : les paires (sujet, objet) sont demandées en parallèle,
+		au plus `concurrency` à la fois (ou selon `semaphore`, qui peut être partagé entre plusieurs appels).
+		Retourne les résultats dans l'ordre des paires.
+		Avec `return_exceptions`, une paire en erreur donne son exception au lieu de faire échouer tout le lot.
+		"""
+		return await self._gather_bounded(
+			[partial(self.fetch_relation_between, sujet, objet, params) for sujet, objet in pairs],
+			semaphore or asyncio.Semaphore(concurrency),
+			return_exceptions=return_exceptions,
+		)
+
+	async def fetch_annotations_bulk(self, rel_ids: List[int], semaphore: Optional[asyncio.Semaphore] = None) -> dict[int, Optional[str]]:
+		"""
+		Récupère les annotations de plusieurs relations en parallèle, au plus 16 requêtes à la fois
+		(ou selon `semaphore`, qui peut être partagé entre plusieurs appels).
+		Retourne un dict id de relation -> annotation (None si absente ou en erreur).
+		"""
+		rel_ids = list(dict.fromkeys(rel_ids))
+		results = await self._gather_bounded(
+			[partial(self.fetch_relation_anotation, rel_id) for rel_id in rel_ids],
+			semaphore or asyncio.Semaphore(16),
+			return_exceptions=True,
+		)
+		return {
+			rel_id: None if isinstance(annotation, Exception) else annotation
+			for rel_id, annotation in zip(rel_ids, results)
+		}
 
 	async def fetch_relations_types(self):
 		"""
 		Récupère la liste des types de relations disponibles dans l'API JDM.
 		Retourne une liste d'objets `RelationType`.
+		La liste change rarement : elle est gardée dans `_relation_types_file` et relue tant qu'elle a moins de 7 jours.
 		"""
-		response = await self._fetch("relations_types")
-		if response.status == 200:
-			raw_data = await response.json()
-			return {item["id"] :  RelationType(
-				id=item["id"],
-				name=item["name"],
-				gpname=item["gpname"],
-				help=item["help"],
-				oppos=item["oppos"],
-				posyes=item["posyes"],
-				posno=item["posno"]
-			) for item in raw_data}
-		else:
-			response.raise_for_status()
-			
+		raw_data = self._read_relation_types_file()
+		if raw_data is None:
+			endpoint = self._getEndpoint("relations_types")
+			status, body = await self._fetch(endpoint)
+			if status != 200:
+				raise JdmApiError(endpoint, status)
+			raw_data = self._json(body)
+			self._relation_types_file.parent.mkdir(parents=True, exist_ok=True)
+			self._relation_types_file.write_bytes(orjson.dumps(raw_data))
+
+		return {item["id"] :  RelationType(
+			id=item["id"],
+			name=item["name"],
+			gpname=item["gpname"],
+			help=item["help"],
+			oppos=item["oppos"],
+			posyes=item["posyes"],
+			posno=item["posno"]
+		) for item in raw_data}
+
+	def _read_relation_types_file(self) -> Optional[list]:
+		"""Liste brute des types de relations gardée sur disque, si elle existe et n'a pas expiré."""
+		try:
+			if time.time() - self._relation_types_file.stat().st_mtime < RELATION_TYPES_TTL.total_seconds():
+				return orjson.loads(self._relation_types_file.read_bytes())
+		except (OSError, orjson.JSONDecodeError):
+			pass
+		return None
+
 	def get_relation_type_by_name(self, name: str) -> RelationType | None:
 		"""
 		Récupère l'identifiant d'un type de relation en le cherchant par son nom.
 		"""
 		if self.relation_types is None:
 			raise RuntimeError("relation_types not initialized. Make sure to use 'async with JdmApi()' first.")
-			
-		for relation_type in self.relation_types.values():
-			if relation_type.name == name or relation_type.gpname == name:
-				return relation_type
-		return None
\ No newline at end of file
+
+		return self._relation_types_by_name.get(name)
\ No newline at end of file
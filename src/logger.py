@@ -1,5 +1,25 @@
 from rich.console import Console
 from rich.text import Text
+import numpy as np
+
+# Types d'inférence dont la chaîne part de l'objet : les deux termes sont alors inversés à l'affichage
+_ISA_TYPES = frozenset({"isa", ""})
+
+# Paliers de score : niveau 0 sous .5, 1 entre .5 et .7, 2 à partir de .7
+_SCORE_THRESHOLDS = (.5, .7)
+_SCORE_STYLES = ("red", "yellow", "bold green")
+_SCORE_EMOJIS = ("🔴", "🟡", "🟢")
+# Au-delà de ce nombre d'inférences, les niveaux sont calculés en un seul appel numpy
+_VECTORIZE_FROM = 128
+
+
+def _score_levels(inferences) -> list[int]:
+	"""Niveau de score (indice dans _SCORE_STYLES / _SCORE_EMOJIS) de chaque inférence."""
+	if len(inferences) > _VECTORIZE_FROM:
+		scores = np.fromiter((inference.score for inference in inferences), dtype=np.float64, count=len(inferences))
+		return np.searchsorted(_SCORE_THRESHOLDS, scores, side="right").tolist()
+	low, high = _SCORE_THRESHOLDS
+	return [2 if inference.score >= high else 1 if inference.score >= low else 0 for inference in inferences]
 
 
 class InferenceLogger:
@@ -17,56 +37,59 @@ class InferenceLogger:
 		line.append("➤  non", style="bold red")
 		self.console.print(line)
 
-	def _render_single_inference(self, idx, inference, max_middle = 45):
-		arrow = "➝ "
-		# Texte de la ligne
-		line = Text()
-
-		# Numéro
-		line.append(f"{idx:>3}. ", style="dim")
+	@staticmethod
+	def _orient_terms(inference):
+		"""
+		Partie commune aux rendus terminal et Discord : (swap, term1, term2, middle_rel).
+		`swap` indique le cas spécial isa (voir _ISA_TYPES).
+		"""
+		size = max(len(inference.sujet),len(inference.objet))
+		swap = inference.t in _ISA_TYPES
+		term1, term2 = (inference.objet, inference.sujet) if swap else (inference.sujet, inference.objet)
+		middle_rel = inference.rel if inference.t == "transitivity" else inference.t
+		return swap, term1.ljust(size), term2.ljust(size), middle_rel
 
-		# Emote + Oui
-		line.append("➤  oui", style="bold green")
-		line.append(" | ")
+	def _render_single_inference(self, idx, inference, max_middle = 45, level = None) -> Text:
+		"""Construit la ligne d'une inférence ; l'affichage est fait en une fois par `render_inferences`."""
+		arrow = "➝ "
 
 		# Explication : sujet ➝ gen ; gen ➝ obj
-		size = max(len(inference.sujet),len(inference.objet))
-		if inference.t in {"isa",}: # cas spécial
-			term1 = f"{inference.objet:<{size}}"
-			term2 = f"{inference.sujet:<{size}}"
-		else:
-			term1 = f"{inference.sujet:<{size}}"
-			term2 = f"{inference.objet:<{size}}"
-		
-		middle_rel = inference.t if (inference.t != "transitivity") else inference.rel
-
-		line.append(term1, style="bold magenta")
-		line.append(f" {middle_rel:<5}", style="italic dim")
-		line.append(f" {arrow} ")
-		line.append(f"{inference.gen:<{max_middle}}", style="bold cyan")
-
-		if inference.t in {"isa",}:
-			line.append(term2, style="bold yellow")
-			line.append(f" {inference.rel:<7}", style="italic dim")
-			line.append(f" {arrow} ")
-			line.append(f"{inference.gen:>{max_middle}}", style="bold cyan")
+		swap, term1, term2, middle_rel = self._orient_terms(inference)
+		gen = inference.gen.ljust(max_middle)
+		rel = " " + inference.rel.ljust(7)
+
+		if swap:
+			explanation = (
+				(gen, "bold cyan"),
+				(term2, "bold yellow"),
+				(rel, "italic dim"),
+				f" {arrow} ",
+				(inference.gen.rjust(max_middle), "bold cyan"),
+			)
 		else :
-			line.append(f"{inference.gen:<{max_middle}}", style="bold cyan")
-			line.append(f" {inference.rel:<7}", style="italic dim")
-			line.append(f" {arrow} ")
-			line.append(term2, style="bold yellow")
-		# Score
-		line.append(" | ")
-
-		score_style = (
-			"bold green" if inference.score >= .7 else
-			"yellow" if inference.score >= .5 else
-			"red"
-		)
-		line.append(f"{inference.score:<.2f}", style=score_style)
+			explanation = (
+				(gen + gen, "bold cyan"), # gen affiché deux fois de suite dans le même style : un seul segment
+				(rel, "italic dim"),
+				f" {arrow} ",
+				(term2, "bold yellow"),
+			)
 
-		# Affichage
-		self.console.print(line)
+		if level is None:
+			level = _score_levels((inference,))[0]
+		score_style = _SCORE_STYLES[level]
+
+		# Numéro | Emote + Oui | Explication | Score, assemblés en un seul appel
+		return Text.assemble(
+			(f"{idx:>3}. ", "dim"),
+			("➤  oui", "bold green"),
+			" | ",
+			(term1, "bold magenta"),
+			(" " + middle_rel.ljust(5), "italic dim"),
+			f" {arrow} ",
+			*explanation,
+			" | ",
+			(f"{inference.score:.2f}", score_style),
+		)
 
 	def render_inferences(self, inferences):
 		if len(inferences) == 0:
@@ -74,8 +97,23 @@ class InferenceLogger:
 			return
 		
 		max_middle = len(max(inferences, key=lambda x: len(x.gen)).gen) + 10
-		for idx, inferred in enumerate(inferences, 1):
-			self._render_single_inference(idx, inferred, max_middle)
+		# Un seul print pour toutes les lignes plutôt qu'un par inférence
+		text = Text()
+		levels = _score_levels(inferences)
+		for idx, (inferred, level) in enumerate(zip(inferences, levels), 1):
+			line = self._render_single_inference(idx, inferred, max_middle, level)
+			if line is not None:
+				text.append_text(line)
+				text.append("\n")
+		if text:
+			text.rstrip()
+			self.console.print(text, soft_wrap=True)
+
+# Gabarits des messages Discord, préparés une seule fois (➝ est la flèche des lignes d'inférence)
+_BOT_ISA_MESSAGE = "```\n{:>3}. ✅ oui | {} {} ➝  {} {} {} ➝  {} | {} {:.2f}\n```".format
+_BOT_MESSAGE = "```\n{:>3}. ✅ oui | {} {} ➝  {:^{}} {} ➝  {} | {} {:.2f}\n```".format
+# Limite Discord de 2000 caractères par message, avec de la marge
+_DISCORD_CHUNK_SIZE = 1900
 
 class InferenceLoggerBot(InferenceLogger):
 	def __init__(self, context, verbose = False):
@@ -91,52 +129,46 @@ class InferenceLoggerBot(InferenceLogger):
 			super()._render_no_result()
 		self.messages.append("```\n1. ➤ non\n```")
 
-	def _render_single_inference(self, idx, inference, max_middle=40):
+	def _render_single_inference(self, idx, inference, max_middle=40, level=None):
 		"""Override pour Discord avec formatage markdown"""
-		if(self.verbose):
-			super()._render_single_inference(idx, inference)
+		if level is None:
+			level = _score_levels((inference,))[0]
+		line = super()._render_single_inference(idx, inference, level=level) if self.verbose else None
 
-		score_emoji = "🟢" if inference.score >= .7 else "🟡" if inference.score >= .5 else "🔴"
-		arrow = "➝ "
+		score_emoji = _SCORE_EMOJIS[level]
 
-		size = max(len(inference.sujet),len(inference.objet))
-		if inference.t in {"isa",""}: # cas spécial
-			term1 = f"{inference.objet:<{size}}"
-			term2 = f"{inference.sujet:<{size}}"
-		else:
-			term1 = f"{inference.sujet:<{size}}"
-			term2 = f"{inference.objet:<{size}}"
-		
-		middle_rel = inference.t if (inference.t != "transitivity") else inference.rel
-
-		if inference.t in {"isa",""}:
-			message = (
-				f"```\n"
-				f"{idx:>3}. ✅ oui | "
-				f"{term1} {middle_rel:<7} {arrow} "
-				f"{inference.gen:<{max_middle}} {term2} {inference.rel:<7} {arrow} "
-				f"{inference.gen:>{max_middle}} | {score_emoji} {inference.score:<.2f}\n"
-				f"```"
+		swap, term1, term2, middle_rel = self._orient_terms(inference)
+
+		if swap:
+			message = _BOT_ISA_MESSAGE(
+				idx, term1, middle_rel.ljust(7),
+				inference.gen.ljust(max_middle), term2, inference.rel.ljust(7),
+				inference.gen.rjust(max_middle), score_emoji, inference.score,
 			)
 		else:
-			message = (
-				f"```\n"
-				f"{idx:>3}. ✅ oui | "
-				f"{term1} {middle_rel:<7} {arrow} "
-				f"{inference.gen:^{max_middle}} {inference.rel:<7} {arrow} "
-				f"{term2} | {score_emoji} {inference.score:<.2f}\n"
-				f"```"
+			message = _BOT_MESSAGE(
+				idx, term1, middle_rel.ljust(7),
+				inference.gen, max_middle, inference.rel.ljust(7),
+				term2, score_emoji, inference.score,
 			)
 		self.messages.append(message)
+		return line
 
 	async def send_all(self):
-		"""Envoie tous les messages Discord accumulés"""
-		if not self.messages:
-			return
-			
-		combined = "\n".join(self.messages)
-		if len(combined) < 2000:  # Limite de caractère Discord
-			await self.context.send(combined)
-		else:
-			for msg in self.messages:
-				await self.context.send(msg)
\ No newline at end of file
+		"""Envoie tous les messages Discord accumulés, regroupés en aussi peu d'envois que possible"""
+		# Envois l'un après l'autre : en parallèle, Discord pourrait les afficher dans le désordre
+		for chunk in self._pack_messages():
+			await self.context.send(chunk)
+
+	def _pack_messages(self, max_len=_DISCORD_CHUNK_SIZE):
+		"""Regroupe les messages, séparés par un saut de ligne, en blocs d'au plus `max_len` caractères"""
+		chunk, size = [], 0
+		for msg in self.messages:
+			# +1 pour le saut de ligne qui sépare msg du bloc en cours
+			if chunk and size + 1 + len(msg) > max_len:
+				yield "\n".join(chunk)
+				chunk, size = [], 0
+			size += len(msg) + (1 if chunk else 0)
+			chunk.append(msg)
+		if chunk:
+			yield "\n".join(chunk)
\ No newline at end of file